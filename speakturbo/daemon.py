@@ -5,15 +5,26 @@ Wraps pocket-tts with a TRUE STREAMING HTTP API.
 Audio chunks are sent as they're generated, not buffered.
 """
 
-import io
+import asyncio
+import base64
+import functools
+import hashlib
+import json
 import logging
+import os
 import struct
-import wave
-from typing import Iterator, Optional
+import threading
+from collections import OrderedDict
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Generator, Iterator, Optional, Union
 
+import anyio
+import numpy as np
 import torch
 from fastapi import FastAPI, Form, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
 
 from pocket_tts import TTSModel
 
@@ -23,61 +34,188 @@ logger = logging.getLogger("speakturbo")
 
 # Available voices
 VOICES = ["alba", "marius", "javert", "jean", "fantine", "cosette", "eponine", "azelma"]
+_VOICE_SET = frozenset(VOICES)
+
+# Initial capacity of the /tts/buffered PCM buffer (doubles when exceeded)
+BUFFERED_INITIAL_SECONDS = 10
+
+# Cached audio is replayed in chunks this long, matching live generation
+STREAM_CHUNK_SECONDS = 0.08
+
+# Most items accepted by one /tts/batch request
+BATCH_MAX_ITEMS = 16
 
 # Global model instance (loaded once)
 _model: Optional[TTSModel] = None
 _voice_states: dict = {}
 
+# Only one request may run the model at a time; interleaved generation
+# thrashes caches (and can crash MPS), so requests take turns instead
+_inference_lock = asyncio.Lock()
+
+
+def quantization_enabled() -> bool:
+    """Whether SPEAKTURBO_QUANT=1 asks for an int8-quantized model."""
+    return os.environ.get("SPEAKTURBO_QUANT", "0") == "1"
+
 
 def get_model() -> TTSModel:
-    """Get or load the TTS model (singleton)."""
+    """
+    Get or load the TTS model (singleton).
+    
+    With SPEAKTURBO_QUANT=1, pocket-tts applies its own int8 dynamic
+    quantization to the FlowLM transformer, cutting weight memory traffic
+    on CPU.
+    """
     global _model
     if _model is None:
         logger.info("Loading TTS model...")
-        _model = TTSModel.load_model()
+        _model = TTSModel.load_model(quantize=quantization_enabled())
+        _model.eval()
         logger.info("Model loaded successfully")
     return _model
 
 
+def _prepare_state(state):
+    """
+    Lay out voice-state tensors for fast reuse.
+    
+    Tensors are made contiguous, so each request's deep copy of the state
+    is a plain block copy. Nested dicts are walked.
+    """
+    if isinstance(state, torch.Tensor):
+        return state.contiguous()
+    if type(state) is dict:
+        return {key: _prepare_state(value) for key, value in state.items()}
+    return state
+
+
 def get_voice_state(voice: str) -> dict:
     """Get or compute voice state (cached)."""
     global _voice_states
     if voice not in _voice_states:
         model = get_model()
         logger.info(f"Loading voice state for: {voice}")
-        _voice_states[voice] = model.get_state_for_audio_prompt(voice)
+        _voice_states[voice] = _prepare_state(model.get_state_for_audio_prompt(voice))
     return _voice_states[voice]
 
 
+class PCMCache:
+    """
+    Bounded LRU cache of rendered PCM audio, keyed on (text, voice).
+    
+    Agents repeat short phrases ("Done.", "On it.") constantly; a hit skips
+    the model entirely. Bounded by entry count and total PCM bytes.
+    """
+    
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+    
+    @staticmethod
+    def _key(text: str, voice: str) -> bytes:
+        return hashlib.md5(f"{text}|{voice}".encode("utf-8"), usedforsecurity=False).digest()
+    
+    def get(self, text: str, voice: str) -> Optional[bytes]:
+        """Return cached PCM bytes, or None on a miss."""
+        key = self._key(text, voice)
+        pcm = self._entries.get(key)
+        if pcm is not None:
+            self._entries.move_to_end(key)
+        return pcm
+    
+    def put(self, text: str, voice: str, pcm: bytes) -> None:
+        """Store PCM bytes, evicting least recently used entries as needed."""
+        if len(pcm) > self.max_bytes:
+            return
+        key = self._key(text, voice)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = pcm
+        self._size += len(pcm)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Rendered audio for repeated requests (only touched from the event loop)
+_pcm_cache = PCMCache()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the model and every voice before serving.
+    
+    Runs in each worker process, so with SPEAKTURBO_WORKERS > 1 every
+    worker is warm before it accepts connections.
+    """
+    get_model()
+    
+    # Pre-warm every voice so no request pays the load on first use
+    for voice in VOICES:
+        get_voice_state(voice)
+    yield
+
+
 # FastAPI app
 app = FastAPI(
     title="speakturbo",
     description="Ultra-fast TTS API powered by pocket-tts",
     version="0.2.0",
+    lifespan=lifespan,
 )
 
 
+# The health payload never changes, so it's serialized once
+_HEALTH_RESPONSE = json.dumps({"status": "ready", "voices": VOICES}).encode("utf-8")
+
+
 @app.get("/health")
-def health():
-    """Health check endpoint."""
-    return {
-        "status": "ready",
-        "voices": VOICES,
-    }
+async def health():
+    """Health check endpoint (async: no thread-pool hop per probe)."""
+    return Response(content=_HEALTH_RESPONSE, media_type="application/json")
 
 
-def make_wav_header(sample_rate: int, num_channels: int = 1, bits_per_sample: int = 16) -> bytes:
+def normalize_request(text: Optional[str], voice: str) -> str:
     """
-    Create a WAV header with a very large data size.
+    Validate a (text, voice) request and return the stripped text.
     
-    This allows streaming: we don't know the final size, so we use 0x7FFFFFFF.
-    Players handle this fine - they just read until EOF.
+    Raises HTTPException(400) for empty text or an unknown voice.
+    """
+    text = (text or "").strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    if voice not in _VOICE_SET:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Invalid voice '{voice}'. Available: {VOICES}"
+        )
+    return text
+
+
+def _pack_wav_header(
+    sample_rate: int,
+    num_channels: int = 1,
+    bits_per_sample: int = 16,
+    data_size: int = 0x7FFFFFFF,
+) -> bytes:
+    """
+    Pack a WAV header for `data_size` bytes of PCM (uncached).
+    
+    Used directly when the PCM length is known up front; streaming callers
+    go through make_wav_header.
     """
     byte_rate = sample_rate * num_channels * bits_per_sample // 8
     block_align = num_channels * bits_per_sample // 8
     
-    # Use max int for sizes (streaming WAV trick)
-    data_size = 0x7FFFFFFF
     file_size = data_size + 36
     
     header = struct.pack(
@@ -99,38 +237,243 @@ def make_wav_header(sample_rate: int, num_channels: int = 1, bits_per_sample: in
     return header
 
 
-def pcm_from_chunk(chunk: torch.Tensor) -> bytes:
-    """Convert a torch audio chunk to PCM bytes."""
-    # Clamp and convert to int16
-    chunk_int16 = (chunk.clamp(-1, 1) * 32767).short()
-    return chunk_int16.numpy().tobytes()
+@functools.lru_cache(maxsize=8)
+def make_wav_header(sample_rate: int, num_channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """
+    Create a WAV header with a very large data size.
+    
+    This allows streaming: we don't know the final size, so we use 0x7FFFFFFF.
+    Players handle this fine - they just read until EOF.
+    
+    The header only depends on the audio format, so it's built once per
+    format and reused across requests.
+    """
+    # Use max int for sizes (streaming WAV trick)
+    return _pack_wav_header(sample_rate, num_channels, bits_per_sample, data_size=0x7FFFFFFF)
+
+
+@functools.lru_cache(maxsize=8)
+def trailing_silence(sample_rate: int) -> bytes:
+    """
+    200ms of 16-bit silence, appended to every stream (prevents audio cutoff).
+    
+    bytes are immutable, so one zero-filled buffer per rate is shared by
+    every request.
+    """
+    return bytes(int(sample_rate * 0.2) * 2)
+
+
+# Per-thread conversion buffers (callers may convert from the event loop and
+# from worker threads, so buffers are not shared).
+_pcm_buffers = threading.local()
+
+
+def _thread_buffer(name: str, num_samples: int, dtype) -> np.ndarray:
+    """Get a reusable per-thread buffer with room for num_samples."""
+    buf = getattr(_pcm_buffers, name, None)
+    if buf is None or buf.size < num_samples:
+        buf = np.empty(num_samples, dtype=dtype)
+        setattr(_pcm_buffers, name, buf)
+    return buf[:num_samples]
+
+
+def float_to_pcm16(audio: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Convert float audio in [-1, 1] to int16 PCM, writing into `out`.
+    
+    Two vectorized passes and no temporaries: clip into a reused float32
+    scratch buffer (the input may be a view of a model tensor, so it is
+    left untouched), then scale and truncate straight into `out`.
+    """
+    scratch = np.clip(audio, -1.0, 1.0, out=_thread_buffer("scratch", audio.size, np.float32))
+    np.multiply(scratch, 32767.0, out=out, casting="unsafe")
+    return out
+
+
+def pcm_from_chunk(chunk: torch.Tensor) -> memoryview:
+    """
+    Convert a torch audio chunk to PCM bytes.
+    
+    Samples are written straight into a fresh, uninitialized int16 array
+    and returned as a byte memoryview (StreamingResponse sends
+    buffer-protocol chunks as-is), so there's no .tobytes() copy and no
+    zero-fill. Each call owns its buffer, so results can be kept, e.g. for
+    the PCM cache.
+    """
+    # .numpy() shares storage with the tensor, so no copy happens here
+    audio = chunk.numpy()
+    out = np.empty(audio.size, dtype=np.int16)
+    float_to_pcm16(audio, out)
+    return memoryview(out).cast('B')
+
+
+def collect_pcm(audio_chunks: Iterator[torch.Tensor], sample_rate: int) -> np.ndarray:
+    """
+    Convert a whole chunk stream into a single int16 PCM array.
+    
+    Each chunk is converted straight into a preallocated buffer at a write cursor, so the
+    float audio is never concatenated. The buffer doubles if the utterance
+    outgrows it.
+    """
+    pcm = np.empty(int(sample_rate * BUFFERED_INITIAL_SECONDS), dtype=np.int16)
+    pos = 0
+    for chunk in audio_chunks:
+        audio = chunk.numpy()
+        end = pos + audio.size
+        if end > pcm.size:
+            grown = np.empty(max(end, pcm.size * 2), dtype=np.int16)
+            grown[:pos] = pcm[:pos]
+            pcm = grown
+        float_to_pcm16(audio, pcm[pos:end])
+        pos = end
+    return pcm[:pos]
+
 
+# Marks the end of a background-generated stream
+_STREAM_END = object()
 
-def generate_streaming_wav(
-    audio_chunks: Iterator[torch.Tensor],
+
+async def generate_in_background(
+    audio_chunks: Generator[torch.Tensor, None, None],
+    stop: threading.Event,
+) -> AsyncIterator[torch.Tensor]:
+    """
+    Run a model stream on a worker thread, yielding chunks as they're ready.
+    
+    The model keeps generating the next chunk while the caller converts and
+    sends the current one, instead of the two taking turns. The hand-off
+    queue is unbounded: chunks are ~8 KB and the model only runs slightly
+    ahead of real time.
+    
+    `stop` must be the event passed to generate_audio_stream(stop=...).
+    When iteration stops early it is set and the stream is closed on the
+    worker, and the worker is awaited; pocket-tts's generation thread
+    checks the event before every frame, so it stops after at most one
+    more.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+    
+    def produce():
+        try:
+            for chunk in audio_chunks:
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+                if stop.is_set():
+                    break
+        except Exception as e:
+            loop.call_soon_threadsafe(chunks.put_nowait, e)
+        finally:
+            # A generator can only be closed by the thread iterating it
+            audio_chunks.close()
+            loop.call_soon_threadsafe(chunks.put_nowait, _STREAM_END)
+    
+    worker = loop.run_in_executor(None, produce)
+    try:
+        while (item := await chunks.get()) is not _STREAM_END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # On client disconnect Starlette cancels us, and anyio re-cancels at
+        # every await; shield the wait so the caller's inference lock is
+        # only released once the stream has been stopped and closed
+        with anyio.CancelScope(shield=True):
+            await worker
+
+
+async def generate_streaming_wav(
+    audio_chunks: Generator[torch.Tensor, None, None],
     sample_rate: int,
-) -> Iterator[bytes]:
+    stop: threading.Event,
+    cache_key: Optional[tuple[str, str]] = None,
+) -> AsyncIterator[Union[bytes, memoryview]]:
     """
     Generate WAV data as a stream.
     
+    The inference lock is held until the model has produced its last chunk,
+    so `audio_chunks` must be lazy: a generate_audio_stream generator
+    created with `stop`, so an early exit can halt generation.
+    The model runs on a worker thread (see generate_in_background), keeping
+    the event loop free and overlapping generation with sending.
+    If `cache_key` (text, voice) is given, the PCM is added to the cache
+    once the stream completes.
+    
     Yields:
-        1. WAV header (44 bytes)
-        2. PCM chunks as they're generated (~3840 bytes each = 80ms of audio)
+        1. WAV header (44 bytes) joined with the first PCM chunk
+        2. PCM chunks as they're generated (~3840 bytes each = 80ms of audio),
+           as memoryviews
     """
-    # First, yield the WAV header
-    yield make_wav_header(sample_rate)
+    # Hold the WAV header back and send it with the first PCM chunk, so it
+    # doesn't go out as its own 44-byte write/packet
+    pending = make_wav_header(sample_rate)
+    rendered = []
     
     # Then yield each PCM chunk as it's generated
-    for chunk in audio_chunks:
-        yield pcm_from_chunk(chunk)
+    async with _inference_lock, aclosing(generate_in_background(audio_chunks, stop)) as chunks:
+        async for chunk in chunks:
+            pcm = pcm_from_chunk(chunk)
+            if cache_key is not None:
+                rendered.append(pcm)
+            if pending:
+                yield pending + pcm
+                pending = b""
+            else:
+                yield pcm
+    
+    if cache_key is not None and rendered:
+        _pcm_cache.put(*cache_key, b"".join(rendered))
     
     # Add 200ms of silence at the end (prevents audio cutoff)
-    silence_samples = int(sample_rate * 0.2)
-    yield bytes(silence_samples * 2)
+    yield pending + trailing_silence(sample_rate)
+
+
+async def stream_cached_wav(
+    pcm: bytes,
+    sample_rate: int,
+) -> AsyncIterator[Union[bytes, memoryview]]:
+    """Replay cached PCM as a WAV stream, framed like generate_streaming_wav."""
+    step = int(sample_rate * STREAM_CHUNK_SECONDS) * 2
+    # Slices of a memoryview share the cached bytes instead of copying them
+    view = memoryview(pcm)
+    yield make_wav_header(sample_rate) + view[:step]
+    for start in range(step, len(view), step):
+        yield view[start:start + step]
+    
+    # Same trailing silence as live generation
+    yield trailing_silence(sample_rate)
+
+
+async def render_pcm(model: TTSModel, text: str, voice: str) -> bytes:
+    """
+    Render one utterance to PCM bytes and add it to the cache.
+    
+    The inference lock is held only while this utterance generates.
+    Raises HTTPException(500) if the model produces no audio.
+    """
+    voice_state = await run_in_threadpool(get_voice_state, voice)
+    
+    # Convert chunks into one PCM buffer as they're generated
+    async with _inference_lock:
+        audio_int16 = await run_in_threadpool(
+            collect_pcm,
+            model.generate_audio_stream(
+                model_state=voice_state,
+                text_to_generate=text,
+            ),
+            model.sample_rate,
+        )
+    
+    if not audio_int16.size:
+        raise HTTPException(status_code=500, detail="No audio generated")
+    
+    pcm = audio_int16.tobytes()
+    _pcm_cache.put(text, voice, pcm)
+    return pcm
 
 
 @app.post("/tts")
-def text_to_speech(
+async def text_to_speech(
     text: str = Form(...),
     voice: str = Form(default="alba"),
 ):
@@ -140,43 +483,49 @@ def text_to_speech(
     Audio chunks are sent as they're generated (every ~80ms).
     This enables ultra-low latency playback.
     """
-    # Validate text
-    if not text or not text.strip():
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    # Validate text and voice (text is stripped once, here)
+    text = normalize_request(text, voice)
     
-    # Validate voice
-    if voice not in VOICES:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Invalid voice '{voice}'. Available: {VOICES}"
-        )
-    
-    # Get model and voice state
     model = get_model()
-    voice_state = get_voice_state(voice)
     
-    # Generate audio stream
-    audio_chunks = model.generate_audio_stream(
-        model_state=voice_state,
-        text_to_generate=text.strip(),
-    )
+    # Repeated phrases are served from the cache without touching the model
+    cached = _pcm_cache.get(text, voice)
+    if cached is not None:
+        stream = stream_cached_wav(cached, model.sample_rate)
+    else:
+        # Get voice state (may load from disk, so off the event loop)
+        voice_state = await run_in_threadpool(get_voice_state, voice)
+        
+        # Generate audio stream (stopped early if the client disconnects)
+        stop = threading.Event()
+        audio_chunks = model.generate_audio_stream(
+            model_state=voice_state,
+            text_to_generate=text,
+            stop=stop,
+        )
+        stream = generate_streaming_wav(
+            audio_chunks, model.sample_rate, stop, cache_key=(text, voice)
+        )
     
     # Return TRUE streaming response
     # Chunks are yielded as they're generated!
     return StreamingResponse(
-        generate_streaming_wav(audio_chunks, model.sample_rate),
+        stream,
         media_type="audio/wav",
         headers={
             "Content-Disposition": "attachment; filename=speech.wav",
             "X-Sample-Rate": str(model.sample_rate),
             "X-Streaming": "true",
+            # Keep proxies (nginx) from buffering or caching the stream
+            "X-Accel-Buffering": "no",
+            "Cache-Control": "no-store",
         },
     )
 
 
 # Also provide a buffered endpoint for compatibility
 @app.post("/tts/buffered")
-def text_to_speech_buffered(
+async def text_to_speech_buffered(
     text: str = Form(...),
     voice: str = Form(default="alba"),
 ):
@@ -185,57 +534,120 @@ def text_to_speech_buffered(
     
     Waits for full audio before sending. Use /tts for streaming.
     """
-    if not text or not text.strip():
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    text = normalize_request(text, voice)
+    
+    model = get_model()
+    
+    pcm = _pcm_cache.get(text, voice)
+    if pcm is None:
+        pcm = await render_pcm(model, text, voice)
+    
+    # Write proper WAV: exact-size header + PCM, sent with a Content-Length
+    header = _pack_wav_header(model.sample_rate, data_size=len(pcm))
+    return Response(content=header + pcm, media_type="audio/wav")
+
+
+class BatchItem(BaseModel):
+    """One text to render in a /tts/batch request."""
+    text: str
+    voice: str = "alba"
+
+
+class BatchRequest(BaseModel):
+    """Body of a /tts/batch request."""
+    items: list[BatchItem]
+
+
+@app.post("/tts/batch")
+async def text_to_speech_batch(request: BatchRequest):
+    """
+    Generate speech for several texts in one request.
+    
+    pocket-tts has no batched generation, so uncached items are rendered
+    one at a time, taking the inference lock per item so /tts streams can
+    get in between. Repeated and cached items are only rendered once.
     
-    if voice not in VOICES:
+    Returns {"items": [{"text", "voice", "audio"}]} in request order, where
+    "audio" is a base64-encoded WAV.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch cannot be empty")
+    
+    if len(request.items) > BATCH_MAX_ITEMS:
         raise HTTPException(
-            status_code=400, 
-            detail=f"Invalid voice '{voice}'. Available: {VOICES}"
+            status_code=400,
+            detail=f"Batch too large ({len(request.items)} items, max {BATCH_MAX_ITEMS})",
         )
     
-    model = get_model()
-    voice_state = get_voice_state(voice)
-    
-    # Collect all chunks
-    audio_chunks = list(model.generate_audio_stream(
-        model_state=voice_state,
-        text_to_generate=text.strip(),
-    ))
+    keys = []
+    for item in request.items:
+        keys.append((normalize_request(item.text, item.voice), item.voice))
     
-    if not audio_chunks:
-        raise HTTPException(status_code=500, detail="No audio generated")
+    model = get_model()
     
-    # Concatenate and convert
-    audio = torch.cat(audio_chunks)
-    audio_int16 = (audio.clamp(-1, 1) * 32767).short().numpy()
+    # Serve what we can from the cache, render each remaining pair once
+    pcms = {}
+    missing = []
+    for key in keys:
+        if key in pcms or key in missing:
+            continue
+        cached = _pcm_cache.get(*key)
+        if cached is not None:
+            pcms[key] = cached
+        else:
+            missing.append(key)
     
-    # Write proper WAV
-    buffer = io.BytesIO()
-    with wave.open(buffer, 'wb') as wav:
-        wav.setnchannels(1)
-        wav.setsampwidth(2)
-        wav.setframerate(model.sample_rate)
-        wav.writeframes(audio_int16.tobytes())
+    for text, voice in missing:
+        pcms[(text, voice)] = await render_pcm(model, text, voice)
     
-    return StreamingResponse(
-        iter([buffer.getvalue()]),
-        media_type="audio/wav",
-    )
+    items = []
+    for text, voice in keys:
+        pcm = pcms[(text, voice)]
+        wav = _pack_wav_header(model.sample_rate, data_size=len(pcm)) + pcm
+        items.append({
+            "text": text,
+            "voice": voice,
+            "audio": base64.b64encode(wav).decode("ascii"),
+        })
+    return {"items": items}
 
 
-def run_server(host: str = "127.0.0.1", port: int = 7123):
-    """Run the daemon server."""
-    import uvicorn
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 7123,
+    workers: Optional[int] = None,
+    quantize: Optional[bool] = None,
+):
+    """
+    Run the daemon server.
     
-    # Pre-load model before starting server
-    get_model()
+    Each worker process loads its own model and serializes its own
+    inference, so workers scale throughput at the cost of memory. Defaults
+    to SPEAKTURBO_WORKERS (or 1). uvicorn picks uvloop and httptools
+    automatically when they're installed (the uvicorn[standard] extra).
     
-    # Pre-warm default voice
-    get_voice_state("alba")
+    `quantize` overrides SPEAKTURBO_QUANT; it's passed on through the
+    environment so worker processes pick it up too.
+    """
+    import uvicorn
     
-    logger.info(f"Starting speakturbo daemon on {host}:{port}")
-    uvicorn.run(app, host=host, port=port, log_level="warning")
+    if workers is None:
+        workers = int(os.environ.get("SPEAKTURBO_WORKERS", "1"))
+    if quantize is not None:
+        os.environ["SPEAKTURBO_QUANT"] = "1" if quantize else "0"
+    
+    logger.info(f"Starting speakturbo daemon on {host}:{port} ({workers} worker(s))")
+    if workers > 1:
+        # Multiple workers need an import string so each can load the app
+        uvicorn.run(
+            "speakturbo.daemon:app",
+            host=host,
+            port=port,
+            workers=workers,
+            log_level="warning",
+        )
+    else:
+        uvicorn.run(app, host=host, port=port, log_level="warning")
 
 
 if __name__ == "__main__":
@@ -3,22 +3,56 @@
 Raw TCP streaming server - bypasses HTTP buffering.
 
 This is a proof of concept to show that true streaming works.
+
+Protocol: the client sends `voice_name\ntext`. The text may be followed by
+a newline, by closing the write side, or by nothing at all (as the
+original single-recv protocol did); the request is complete once the
+client goes quiet for REQUEST_IDLE_SECONDS.
 """
 
+import functools
+import queue
 import socket
 import struct
 import sys
+import threading
 import time
+from contextlib import closing
 
+import numpy as np
 import torch
 from pocket_tts import TTSModel
 
 HOST = "127.0.0.1"
 PORT = 7124
 
+# Give up on a client that sends nothing for this long
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+# Once voice and some text have arrived, a pause this long ends the request
+REQUEST_IDLE_SECONDS = 0.05
+
+# Roomy send buffer so sendall returns quickly and the model keeps going
+SEND_BUFFER_BYTES = 256 * 1024
+
+# Most already-generated chunks sent in one scatter-gather syscall. Only
+# chunks that are ready get batched; ready audio is never held back.
+CHUNKS_PER_SEND = 3
+
+# Chunks the model may run ahead of the sender
+PIPELINE_DEPTH = 4
+
+# Marks the end of a background-generated stream
+_STREAM_END = object()
+
+# Reusable conversion buffers (clients are handled one at a time)
+_pcm_buf = np.empty(0, dtype=np.int16)
+_scratch_buf = np.empty(0, dtype=np.float32)
+
 
+@functools.lru_cache(maxsize=8)
 def make_wav_header(sample_rate: int) -> bytes:
-    """Create WAV header with streaming-friendly size."""
+    """Create WAV header with streaming-friendly size (cached per rate)."""
     byte_rate = sample_rate * 2  # 16-bit mono
     data_size = 0x7FFFFFFF
     file_size = data_size + 36
@@ -30,14 +64,143 @@ def make_wav_header(sample_rate: int) -> bytes:
     )
 
 
+@functools.lru_cache(maxsize=8)
+def trailing_silence(sample_rate: int) -> bytes:
+    """200ms of 16-bit silence (shared across requests, bytes are immutable)."""
+    return bytes(int(sample_rate * 0.2) * 2)
+
+
+def pcm_from_chunk(chunk: torch.Tensor) -> bytes:
+    """Convert a torch audio chunk to PCM bytes via the reusable buffer."""
+    global _pcm_buf, _scratch_buf
+    audio = chunk.numpy()
+    if _pcm_buf.size < audio.size:
+        _pcm_buf = np.empty(audio.size, dtype=np.int16)
+        _scratch_buf = np.empty(audio.size, dtype=np.float32)
+    out = _pcm_buf[:audio.size]
+    # Clip into scratch, then scale and truncate straight into the int16 buffer
+    scratch = np.clip(audio, -1.0, 1.0, out=_scratch_buf[:audio.size])
+    np.multiply(scratch, 32767.0, out=out, casting="unsafe")
+    return out.tobytes()
+
+
+def send_buffers(conn, buffers) -> None:
+    """Send several buffers with scatter-gather sendmsg, like sendall."""
+    views = [memoryview(b) for b in buffers]
+    while views:
+        sent = conn.sendmsg(views)
+        # Drop fully sent buffers, trim a partially sent one
+        while views and sent >= len(views[0]):
+            sent -= len(views.pop(0))
+        if sent:
+            views[0] = views[0][sent:]
+
+
+def generate_in_background(
+    audio_chunks,
+    stop: threading.Event,
+    depth: int = PIPELINE_DEPTH,
+    max_batch: int = 1,
+):
+    """
+    Run a model stream on a worker thread, yielding lists of ready chunks.
+    
+    Generation of the next chunk overlaps conversion and sending of the
+    current ones. Each list holds whatever is already queued (at least one
+    chunk, at most `max_batch`), so callers never wait for a full batch.
+    
+    `stop` must be the event passed to generate_audio_stream(stop=...).
+    Closing the generator sets it and waits for the worker, which closes
+    the model stream, so generation halts within a frame.
+    """
+    chunks = queue.Queue(maxsize=depth)
+    
+    def produce():
+        try:
+            for chunk in audio_chunks:
+                chunks.put(chunk)
+                if stop.is_set():
+                    break
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            # A generator can only be closed by the thread iterating it
+            audio_chunks.close()
+            chunks.put(_STREAM_END)
+    
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        done = False
+        while not done:
+            # Block for one chunk, then take whatever else is ready
+            batch = []
+            item = chunks.get()
+            while True:
+                if item is _STREAM_END:
+                    done = True
+                    break
+                if isinstance(item, Exception):
+                    if batch:
+                        yield batch
+                    raise item
+                batch.append(item)
+                if len(batch) >= max_batch:
+                    break
+                try:
+                    item = chunks.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                yield batch
+    finally:
+        # Keep draining so a worker blocked on a full queue can exit
+        stop.set()
+        while worker.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def read_request(conn) -> tuple[str, str]:
+    """
+    Read a `voice_name\ntext` request, returning (voice, text).
+    
+    Keeps reading until the text line ends with a newline, the client
+    closes its write side, or it goes quiet, so text split across TCP
+    segments isn't truncated and an idle client can't hang the server.
+    """
+    data = b""
+    try:
+        while data.count(b"\n") < 2:
+            # Short idle timeout once there's text to work with
+            has_text = b"\n" in data and not data.endswith(b"\n")
+            conn.settimeout(REQUEST_IDLE_SECONDS if has_text else REQUEST_TIMEOUT_SECONDS)
+            part = conn.recv(4096)
+            if not part:
+                break
+            data += part
+    except socket.timeout:
+        pass
+    finally:
+        conn.settimeout(None)
+    
+    lines = data.decode('utf-8', errors='replace').split('\n')
+    voice = lines[0].strip() or "alba"
+    text = (lines[1].strip() if len(lines) > 1 else "") or "Hello world"
+    return voice, text
+
+
 def handle_client(conn, model, voice_states):
     """Handle a single client connection."""
     try:
-        # Read request (simple protocol: voice_name\ntext)
-        data = conn.recv(4096).decode('utf-8')
-        lines = data.strip().split('\n')
-        voice = lines[0] if len(lines) > 0 else "alba"
-        text = lines[1] if len(lines) > 1 else "Hello world"
+        # Send each write immediately (no Nagle coalescing delay)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+        
+        # Read request (protocol in the module docstring)
+        voice, text = read_request(conn)
         
         print(f"Request: voice={voice}, text={text[:50]}...")
         
@@ -46,24 +209,35 @@ def handle_client(conn, model, voice_states):
             voice_states[voice] = model.get_state_for_audio_prompt(voice)
         voice_state = voice_states[voice]
         
-        # Send WAV header immediately
-        conn.sendall(make_wav_header(model.sample_rate))
-        print(f"  Sent WAV header")
+        # WAV header goes out in the same syscall as the first chunk
+        pending = [make_wav_header(model.sample_rate)]
         
         # Stream audio chunks as they're generated
         start = time.perf_counter()
-        for i, chunk in enumerate(model.generate_audio_stream(voice_state, text)):
-            # Convert to PCM bytes
-            pcm = (chunk.clamp(-1, 1) * 32767).short().numpy().tobytes()
-            conn.sendall(pcm)
-            
-            elapsed = (time.perf_counter() - start) * 1000
-            if i < 5 or i % 20 == 0:
-                print(f"  Chunk {i+1}: {len(pcm)} bytes at {elapsed:.0f}ms")
+        stop = threading.Event()
+        batches = generate_in_background(
+            model.generate_audio_stream(voice_state, text, stop=stop),
+            stop,
+            max_batch=CHUNKS_PER_SEND,
+        )
+        i = 0
+        with closing(batches):
+            for batch in batches:
+                # Convert and send every ready chunk in one syscall
+                for chunk in batch:
+                    pcm = pcm_from_chunk(chunk)
+                    pending.append(pcm)
+                    
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if i < 5 or i % 20 == 0:
+                        print(f"  Chunk {i+1}: {len(pcm)} bytes at {elapsed:.0f}ms")
+                    i += 1
+                send_buffers(conn, pending)
+                pending.clear()
         
         # Add trailing silence
-        silence = bytes(int(model.sample_rate * 0.2) * 2)
-        conn.sendall(silence)
+        pending.append(trailing_silence(model.sample_rate))
+        send_buffers(conn, pending)
         
         print(f"  Done!")
         
@@ -76,6 +250,7 @@ def handle_client(conn, model, voice_states):
 def main():
     print("Loading model...")
     model = TTSModel.load_model()
+    model.eval()
     voice_states = {"alba": model.get_state_for_audio_prompt("alba")}
     print(f"Model loaded. Starting server on {HOST}:{PORT}")
     
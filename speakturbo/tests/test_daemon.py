@@ -5,6 +5,7 @@ Run with: cd speakturbo && uv run pytest tests/test_daemon.py -v
 """
 
 import io
+import struct
 import wave
 import pytest
 from fastapi.testclient import TestClient
@@ -74,6 +75,50 @@ class TestTTSEndpoint:
             assert len(response.content) > 100, f"Voice {voice} returned too little audio"
 
 
+class TestBufferedEndpoint:
+    """Buffered WAV for clients that can't stream."""
+    
+    def test_buffered_wav_has_exact_sizes(self, client):
+        response = client.post("/tts/buffered", data={"text": "Hello"})
+        assert response.status_code == 200
+        assert int(response.headers["content-length"]) == len(response.content)
+        with wave.open(io.BytesIO(response.content), 'rb') as wav:
+            assert wav.getframerate() == 24000
+            assert wav.getnframes() * 2 == len(response.content) - 44
+
+
+class TestBatchEndpoint:
+    """Several texts in one request."""
+    
+    def test_batch_returns_wav_per_item_in_order(self, client):
+        import base64
+        
+        items = [
+            {"text": "Hello", "voice": "alba"},
+            {"text": "Done.", "voice": "marius"},
+            {"text": "Hello", "voice": "alba"},
+        ]
+        response = client.post("/tts/batch", json={"items": items})
+        assert response.status_code == 200
+        results = response.json()["items"]
+        assert [(r["text"], r["voice"]) for r in results] == [
+            ("Hello", "alba"), ("Done.", "marius"), ("Hello", "alba"),
+        ]
+        for result in results:
+            wav_io = io.BytesIO(base64.b64decode(result["audio"]))
+            with wave.open(wav_io, 'rb') as wav:
+                assert wav.getnframes() > 0
+    
+    def test_batch_rejects_invalid_voice(self, client):
+        items = [{"text": "Hello", "voice": "nonexistent"}]
+        response = client.post("/tts/batch", json={"items": items})
+        assert response.status_code == 400
+    
+    def test_batch_rejects_empty(self, client):
+        response = client.post("/tts/batch", json={"items": []})
+        assert response.status_code == 400
+
+
 class TestTTSValidation:
     """Input validation."""
     
@@ -105,6 +150,71 @@ class TestTTSStreaming:
             chunks = list(response.iter_bytes(chunk_size=1024))
             # Should have multiple chunks for streaming
             assert len(chunks) >= 1
+    
+    def test_response_disables_proxy_buffering(self, client):
+        response = client.post("/tts", data={"text": "Hello"})
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.headers["cache-control"] == "no-store"
+        assert "content-encoding" not in response.headers
+
+
+class TestInferenceLock:
+    """The model must never run for two requests at once."""
+    
+    def test_disconnect_stops_generation_before_lock_release(self):
+        import queue
+        import threading
+        import time
+        import anyio
+        import torch
+        from speakturbo import daemon
+        
+        threads = []
+        
+        def model_stream(stop):
+            # Like generate_audio_stream: frames come from a background
+            # thread that only checks `stop` between frames
+            frames = queue.Queue()
+            
+            def generate():
+                for _ in range(100):
+                    if stop.is_set():
+                        break
+                    time.sleep(0.02)
+                    frames.put(torch.zeros(1920))
+                frames.put(None)
+            
+            thread = threading.Thread(target=generate, daemon=True)
+            threads.append(thread)
+            thread.start()
+            while (frame := frames.get()) is not None:
+                yield frame
+        
+        stop = threading.Event()
+        stream = model_stream(stop)
+        
+        async def scenario():
+            async def consume():
+                async for _ in daemon.generate_streaming_wav(stream, 24000, stop):
+                    pass
+            
+            # Cancel part-way, the way Starlette does on client disconnect
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(consume)
+                await anyio.sleep(0.12)
+                tg.cancel_scope.cancel()
+                cancelled = time.perf_counter()
+            
+            # Released once generation stopped, not after all 100 frames
+            assert time.perf_counter() - cancelled < 0.5
+            assert not daemon._inference_lock.locked()
+            assert stop.is_set()
+            # The stream was closed, and its thread halts within a frame
+            assert stream.gi_frame is None
+            threads[0].join(timeout=0.1)
+            assert not threads[0].is_alive()
+        
+        anyio.run(scenario)
 
 
 class TestPerformance:
@@ -146,3 +256,73 @@ class TestPerformance:
         
         rtf = audio_duration / generation_time
         assert rtf > 1.0, f"RTF was {rtf:.1f}x, expected > 1.0x"
+
+
+class TestPCMConversion:
+    """Float audio to int16 PCM conversion."""
+    
+    def test_float_to_pcm16_clamps_and_scales(self):
+        import numpy as np
+        from speakturbo.daemon import float_to_pcm16
+        
+        audio = np.array([-2.0, -1.0, 0.0, 0.5, 1.0, 2.0], dtype=np.float32)
+        out = float_to_pcm16(audio, np.empty(audio.size, dtype=np.int16))
+        assert out.tolist() == [-32767, -32767, 0, 16383, 32767, 32767]
+        # Input is left untouched
+        assert audio[0] == -2.0
+    
+    def test_pcm_from_chunk_returns_owned_buffer(self):
+        import torch
+        from speakturbo.daemon import pcm_from_chunk
+        
+        first = pcm_from_chunk(torch.tensor([0.5, -2.0]))
+        second = pcm_from_chunk(torch.tensor([0.0, 0.0]))
+        assert bytes(first) == struct.pack('<2h', 16383, -32767)
+        assert bytes(second) == bytes(4)
+    
+    def test_collect_pcm_grows_past_initial_capacity(self):
+        import torch
+        from speakturbo.daemon import BUFFERED_INITIAL_SECONDS, collect_pcm
+        
+        sample_rate = 100
+        chunk = torch.full((sample_rate,), 0.5)
+        num_chunks = BUFFERED_INITIAL_SECONDS * 3
+        pcm = collect_pcm(iter([chunk] * num_chunks), sample_rate)
+        assert pcm.size == sample_rate * num_chunks
+        assert (pcm == 16383).all()
+
+
+class TestPCMCache:
+    """Rendered-audio LRU cache."""
+    
+    def test_get_returns_stored_pcm(self):
+        from speakturbo.daemon import PCMCache
+        
+        cache = PCMCache()
+        assert cache.get("Done.", "alba") is None
+        cache.put("Done.", "alba", b"\x01\x00")
+        assert cache.get("Done.", "alba") == b"\x01\x00"
+        assert cache.get("Done.", "marius") is None
+    
+    def test_evicts_least_recently_used(self):
+        from speakturbo.daemon import PCMCache
+        
+        cache = PCMCache(max_entries=2)
+        cache.put("a", "alba", b"a")
+        cache.put("b", "alba", b"b")
+        cache.get("a", "alba")
+        cache.put("c", "alba", b"c")
+        assert len(cache) == 2
+        assert cache.get("b", "alba") is None
+        assert cache.get("a", "alba") == b"a"
+    
+    def test_respects_byte_budget(self):
+        from speakturbo.daemon import PCMCache
+        
+        cache = PCMCache(max_bytes=4)
+        cache.put("a", "alba", b"aaa")
+        cache.put("b", "alba", b"bbb")
+        assert cache.get("a", "alba") is None
+        cache.put("c", "alba", b"ccccc")
+        assert cache.get("c", "alba") is None
+        assert cache.get("b", "alba") == b"bbb"